@@ -26,10 +26,45 @@
     <https://www.gnu.org/licenses/>.
 '''
 
+from operator import sub
+from itertools import islice
+
 from .exceptions import *
 from .utils import random_byte_message
 
 
+# Exceptions raised by `ICMPReply.raise_for_status`, indexed by address
+# family and ICMP type
+_ICMP_ERRORS = {
+    (4, 3):  ICMPv4DestinationUnreachable,
+    (4, 11): ICMPv4TimeExceeded,
+    (6, 1):  ICMPv6DestinationUnreachable,
+    (6, 3):  ICMPv6TimeExceeded
+}
+
+# Type of ICMP Echo Reply messages for each address family
+_ICMP_ECHO_REPLY = {
+    4: 0,
+    6: 129
+}
+
+# Size of the payload of requests created without a payload
+_DEFAULT_PAYLOAD_SIZE = 56
+
+# Random payload shared by requests of the default size created
+# without a payload
+_default_payload = None
+
+# Text representation of hosts
+_HOST_TEMPLATE = (
+    '  %s\n' + '-' * 60 + '\n'
+    '  Packets sent:     %s\n'
+    '  Packets received: %s\n'
+    '  Packet loss:      %s%%\n'
+    '  Round-trip times: %s ms / %s ms / %s ms\n'
+    '  Jitter:           %s ms\n' + '-' * 60)
+
+
 class ICMPRequest:
     '''
     A user-created object that represents an ICMP Echo Request.
@@ -125,7 +160,22 @@ class ICMPRequest:
         Return a random payload if not defined.
 
         '''
-        return self._payload or random_byte_message(self._payload_size)
+        # Requests of the default size share a random payload generated
+        # once. Other sizes are not kept, as there may be many of them.
+        if not self._payload:
+            if self._payload_size == _DEFAULT_PAYLOAD_SIZE:
+                global _default_payload
+
+                if _default_payload is None:
+                    _default_payload = random_byte_message(
+                        _DEFAULT_PAYLOAD_SIZE)
+
+                self._payload = _default_payload
+
+            else:
+                self._payload = random_byte_message(self._payload_size)
+
+        return self._payload
 
     @property
     def payload_size(self):
@@ -227,23 +277,20 @@ class ICMPReply:
             code, except ICMP Echo Reply messages.
 
         '''
-        if self._family == 6:
-            if self._type == 1:
-                raise ICMPv6DestinationUnreachable(self)
+        # Any family other than IPv6 is handled as IPv4
+        family = 6 if self._family == 6 else 4
+
+        # Echo replies are checked first as they are the most common
+        if self._type == _ICMP_ECHO_REPLY[family]:
+            return
 
-            if self._type == 3:
-                raise ICMPv6TimeExceeded(self)
-        else:
-            if self._type == 3:
-                raise ICMPv4DestinationUnreachable(self)
+        error = _ICMP_ERRORS.get((family, self._type))
 
-            if self._type == 11:
-                raise ICMPv4TimeExceeded(self)
+        if error:
+            raise error(self)
 
-        if (self._family == 4 and self._type != 0 or
-            self._family == 6 and self._type != 129):
-            message = f'Error type: {self._type}, code: {self._code}'
-            raise ICMPError(message, self)
+        message = f'Error type: {self._type}, code: {self._code}'
+        raise ICMPError(message, self)
 
     @property
     def source(self):
@@ -332,13 +379,15 @@ class Host:
         return f'<Host [{self._address}]>'
 
     def __str__(self):
-        return f'  {self._address}\n' + '-' * 60 + '\n' \
-               f'  Packets sent:     {self._packets_sent}\n' \
-               f'  Packets received: {self.packets_received}\n' \
-               f'  Packet loss:      {self.packet_loss * 100}%\n' \
-               f'  Round-trip times: {self.min_rtt} ms / ' \
-               f'{self.avg_rtt} ms / {self.max_rtt} ms\n' \
-               f'  Jitter:           {self.jitter} ms\n' + '-' * 60
+        return _HOST_TEMPLATE % (
+            self._address,
+            self._packets_sent,
+            len(self._rtts),
+            self.packet_loss * 100,
+            self.min_rtt,
+            self.avg_rtt,
+            self.max_rtt,
+            self.jitter)
 
     @property
     def address(self):
@@ -427,16 +476,16 @@ class Host:
         jitter.
 
         '''
-        sum_deltas = 0.0
-        num_deltas = len(self._rtts) - 1
+        rtts = self._rtts
 
-        if num_deltas < 1:
+        if len(rtts) < 2:
             return 0.0
 
-        for i in range(num_deltas):
-            sum_deltas += abs(self._rtts[i] - self._rtts[i + 1])
+        # The differences between consecutive round-trip times are
+        # computed and summed by builtins rather than a Python loop
+        deltas = map(sub, rtts, islice(rtts, 1, None))
 
-        return round(sum_deltas / num_deltas, 3)
+        return round(sum(map(abs, deltas)) / (len(rtts) - 1), 3)
 
     @property
     def is_alive(self):
@@ -445,7 +494,7 @@ class Host:
         Return a `boolean`.
 
         '''
-        return len(self._rtts) > 0
+        return bool(self._rtts)
 
 
 class Hop(Host):
@@ -469,7 +518,7 @@ class Hop(Host):
         remote host from the current machine.
 
     '''
-    __slots__ = '_address', '_packets_sent', '_rtts', '_distance'
+    __slots__ = '_distance',
 
     def __init__(self, address, packets_sent, rtts, distance):
         super().__init__(address, packets_sent, rtts)
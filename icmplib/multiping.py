@@ -26,9 +26,85 @@
     <https://www.gnu.org/licenses/>.
 '''
 
-import asyncio
+import socket, asyncio
 
-from .ping import async_ping
+from os import listdir
+from functools import partial
+
+from .sockets import ICMPv4Socket, ICMPv6Socket, AsyncSocket
+from .ping import async_ping, _async_ping
+from .utils import *
+
+
+_SHARED_SOCKET_BUFFER_SIZE = 2 ** 20
+_RESERVED_FDS = 16
+
+
+async def _async_ping_shared(address, sockets, count, interval, timeout,
+        source, privileged, **kwargs):
+    '''
+    Send ICMP Echo Request packets to a network host from the sockets
+    shared by all the hosts of the `async_multiping` function. A socket
+    is created for each address family the first time it is needed.
+
+    '''
+    if is_ipv6_address(address):
+        _Socket = ICMPv6Socket
+    else:
+        _Socket = ICMPv4Socket
+
+    if _Socket not in sockets:
+        sock = _Socket(source, privileged)
+
+        # The replies of all the hosts arrive on the same socket, so its
+        # receive buffer is enlarged to avoid losing replies when many
+        # of them arrive at once. The size is capped by the kernel.
+        sock.sock.setsockopt(
+            socket.SOL_SOCKET,
+            socket.SO_RCVBUF,
+            _SHARED_SOCKET_BUFFER_SIZE)
+
+        sockets[_Socket] = AsyncSocket(sock)
+
+    return await _async_ping(sockets[_Socket], address, count, interval,
+        timeout, None, **kwargs)
+
+
+def _get_max_sockets():
+    '''
+    Return the number of sockets that the process can still open
+    according to its limit of file descriptors, or `None` if there is
+    no limit. Only available on Linux.
+
+    '''
+    # Not available on Windows
+    from resource import getrlimit, RLIMIT_NOFILE, RLIM_INFINITY
+
+    limit, _ = getrlimit(RLIMIT_NOFILE)
+
+    if limit == RLIM_INFINITY:
+        return None
+
+    # The number of open file descriptors is unknown when /proc is
+    # not mounted. The limit is then used as is.
+    try:
+        open_fds = len(listdir('/proc/self/fd'))
+
+    except OSError:
+        open_fds = 0
+
+    # A few file descriptors are left to the rest of the program
+    return max(1, limit - open_fds - _RESERVED_FDS)
+
+
+async def _async_ping_bounded(semaphore, ping_host, address):
+    '''
+    Ping the specified address once the semaphore has been acquired.
+    Used to limit the number of hosts pinged at the same time.
+
+    '''
+    async with semaphore:
+        return await ping_host(address=address)
 
 
 async def async_multiping(addresses, count=2, interval=0.5, timeout=2,
@@ -59,9 +135,10 @@ async def async_multiping(addresses, count=2, interval=0.5, timeout=2,
 
     :type concurrent_tasks: int, optional
     :param concurrent_tasks: The maximum number of concurrent tasks to
-        speed up processing. This value cannot exceed the maximum number
-        of file descriptors configured on the operating system.
-        Default to 50.
+        speed up processing. When the `privileged` parameter is disabled
+        on Linux, each task uses its own socket and this value is
+        lowered if needed so as not to exceed the number of file
+        descriptors the process can open. Default to 50.
 
     :type source: str, optional
     :param source: The IP address from which you want to send packets.
@@ -136,31 +213,84 @@ async def async_multiping(addresses, count=2, interval=0.5, timeout=2,
     '''
     loop = asyncio.get_running_loop()
     tasks = []
-    tasks_pending = set()
+    sockets = {}
+
+    # Hostnames are resolved concurrently before sending any request.
+    # Each hostname is only resolved once.
+    hostnames = list({
+        address for address in addresses
+        if is_hostname(address)})
+
+    lookups = await asyncio.gather(*[
+        async_resolve(hostname, family)
+        for hostname in hostnames])
+
+    resolved = {
+        hostname: lookup[0]
+        for hostname, lookup in zip(hostnames, lookups)}
+
+    addresses = [resolved.get(address, address) for address in addresses]
+
+    # Requests are sent from a single socket per address family and
+    # replies are matched using their identifier. This is not possible
+    # with unprivileged sockets on Linux because the kernel replaces the
+    # identifier of every request sent from a socket with the same
+    # value. Nor is it when an identifier is passed in parameters, as
+    # all the hosts would then use it. In that case, each host uses its
+    # own socket.
+    share_sockets = (
+        (privileged or not PLATFORM_LINUX) and
+        'id' not in kwargs)
+
+    # Each task then holds a socket. The number of concurrent tasks is
+    # capped so as not to exceed the limit of file descriptors of the
+    # process, which would make the creation of sockets fail.
+    if not share_sockets:
+        max_sockets = _get_max_sockets()
+
+        if max_sockets:
+            concurrent_tasks = min(concurrent_tasks, max_sockets)
+
+    semaphore = asyncio.Semaphore(concurrent_tasks)
+
+    # The parameters common to all the hosts are bound once
+    if share_sockets:
+        ping_host = partial(_async_ping_shared,
+            sockets=sockets,
+            count=count,
+            interval=interval,
+            timeout=timeout,
+            source=source,
+            privileged=privileged,
+            **kwargs)
+
+    else:
+        ping_host = partial(async_ping,
+            count=count,
+            interval=interval,
+            timeout=timeout,
+            source=source,
+            family=family,
+            privileged=privileged,
+            **kwargs)
 
-    for address in addresses:
-        if len(tasks_pending) >= concurrent_tasks:
-            _, tasks_pending = await asyncio.wait(
-                tasks_pending,
-                return_when=asyncio.FIRST_COMPLETED)
+    try:
+        for address in addresses:
+            coroutine = _async_ping_bounded(semaphore, ping_host, address)
+            tasks.append(loop.create_task(coroutine))
 
-        task = loop.create_task(
-            async_ping(
-                address=address,
-                count=count,
-                interval=interval,
-                timeout=timeout,
-                source=source,
-                family=family,
-                privileged=privileged,
-                **kwargs))
+        return await asyncio.gather(*tasks)
 
-        tasks.append(task)
-        tasks_pending.add(task)
+    finally:
+        for task in tasks:
+            task.cancel()
 
-    await asyncio.wait(tasks_pending)
+        # The cancelled tasks must be finished before the sockets they
+        # use are closed
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-    return [task.result() for task in tasks]
+        for sock in sockets.values():
+            sock.close()
 
 
 def multiping(addresses, count=2, interval=0.5, timeout=2,
@@ -189,9 +319,10 @@ def multiping(addresses, count=2, interval=0.5, timeout=2,
 
     :type concurrent_tasks: int, optional
     :param concurrent_tasks: The maximum number of concurrent tasks to
-        speed up processing. This value cannot exceed the maximum number
-        of file descriptors configured on the operating system.
-        Default to 50.
+        speed up processing. When the `privileged` parameter is disabled
+        on Linux, each task uses its own socket and this value is
+        lowered if needed so as not to exceed the number of file
+        descriptors the process can open. Default to 50.
 
     :type source: str, optional
     :param source: The IP address from which you want to send packets.
@@ -27,7 +27,7 @@
 '''
 
 import asyncio
-from time import sleep
+from time import sleep, monotonic
 
 from .sockets import ICMPv4Socket, ICMPv6Socket, AsyncSocket
 from .models import ICMPRequest, Host
@@ -140,8 +140,11 @@ def ping(address, count=4, interval=1, timeout=2, id=None, source=None,
 
     with _Socket(source, privileged) as sock:
         for sequence in range(count):
+            # The time spent waiting for the previous reply is deducted
+            # from the interval. Requests are never sent closer together
+            # than the interval, even after a timeout.
             if sequence > 0:
-                sleep(interval)
+                sleep(max(0, send_time + interval - monotonic()))
 
             request = ICMPRequest(
                 destination=address,
@@ -149,6 +152,8 @@ def ping(address, count=4, interval=1, timeout=2, id=None, source=None,
                 sequence=sequence,
                 **kwargs)
 
+            send_time = monotonic()
+
             try:
                 sock.send(request)
                 packets_sent += 1
@@ -170,7 +175,9 @@ async def async_ping(address, count=4, interval=1, timeout=2, id=None,
     '''
     Send ICMP Echo Request packets to a network host.
 
-    This function is non-blocking.
+    This function is non-blocking. Unlike the `ping` function, requests
+    are sent at regular intervals without waiting for the reply to the
+    previous request.
 
     :type address: str
     :param address: The IP address, hostname or FQDN of the host to
@@ -267,14 +274,35 @@ async def async_ping(address, count=4, interval=1, timeout=2, id=None,
     else:
         _Socket = ICMPv4Socket
 
+    with AsyncSocket(_Socket(source, privileged)) as sock:
+        return await _async_ping(sock, address, count, interval,
+            timeout, id, **kwargs)
+
+
+async def _async_ping(sock, address, count, interval, timeout, id,
+        **kwargs):
+    '''
+    Send ICMP Echo Request packets to a network host from an existing
+    asynchronous socket. The address must be an IP address of the same
+    family as the socket.
+
+    Used by the `async_ping` and `async_multiping` functions.
+
+    '''
+    loop = asyncio.get_running_loop()
     id = id or unique_identifier()
-    packets_sent = 0
-    rtts = []
+    tasks = []
 
-    with AsyncSocket(_Socket(source, privileged)) as sock:
+    try:
+        start_time = loop.time()
+
+        # Requests are sent at regular intervals without waiting for the
+        # reply to the previous one. Replies are awaited concurrently.
+        # Sending times are computed from the start to avoid any drift.
         for sequence in range(count):
             if sequence > 0:
-                await asyncio.sleep(interval)
+                await asyncio.sleep(
+                    start_time + sequence * interval - loop.time())
 
             request = ICMPRequest(
                 destination=address,
@@ -282,17 +310,40 @@ async def async_ping(address, count=4, interval=1, timeout=2, id=None,
                 sequence=sequence,
                 **kwargs)
 
-            try:
-                sock.send(request)
-                packets_sent += 1
+            tasks.append(loop.create_task(
+                _async_send_and_receive(sock, request, timeout)))
 
-                reply = await sock.receive(request, timeout)
-                reply.raise_for_status()
+        results = await asyncio.gather(*tasks)
 
-                rtt = (reply.time - request.time) * 1000
-                rtts.append(rtt)
+    finally:
+        for task in tasks:
+            task.cancel()
 
-            except ICMPLibError:
-                pass
+    packets_sent = sum(sent for sent, _ in results)
+    rtts = [rtt for _, rtt in results if rtt is not None]
 
     return Host(address, packets_sent, rtts)
+
+
+async def _async_send_and_receive(sock, request, timeout):
+    '''
+    Send an ICMP request and wait for its reply.
+
+    This coroutine returns whether the request has been sent and the
+    round-trip time in milliseconds, or `None` if no valid reply has
+    been received.
+
+    '''
+    sent = False
+
+    try:
+        sock.send(request)
+        sent = True
+
+        reply = await sock.receive(request, timeout)
+        reply.raise_for_status()
+
+        return sent, (reply.time - request.time) * 1000
+
+    except ICMPLibError:
+        return sent, None
@@ -27,14 +27,49 @@
 '''
 
 import socket, asyncio
-from struct import pack, unpack
-from time import time
+from struct import Struct, unpack
+from functools import lru_cache
+from platform import machine
+from time import time, monotonic
 
 from .models import ICMPReply
 from .exceptions import *
 from .utils import PLATFORM_LINUX, PLATFORM_MACOS, PLATFORM_WINDOWS
 
 
+# The SO_TIMESTAMPNS option is not exposed by the socket module. Its
+# value is the same on every Linux architecture except PA-RISC and
+# SPARC, on which the option is not used.
+_SO_TIMESTAMPNS = 35
+_TIMESPEC = Struct('@2l')
+
+_KERNEL_TIMESTAMPS = (PLATFORM_LINUX and
+    not machine().startswith(('parisc', 'sparc')))
+
+_ICMP_HEADER = Struct('!2B3H')
+_ICMP_CHECKSUM = Struct('!H')
+_ICMP_TYPE_CODE = Struct('!2B')
+_ICMP_ID_SEQUENCE = Struct('!2H')
+
+
+@lru_cache(maxsize=1024)
+def _get_sock_address(address, family, type):
+    '''
+    Return the socket address corresponding to an IP address. Unlike
+    hostnames, IP addresses always lead to the same socket address, so
+    the result is cached.
+
+    Raise a `socket.gaierror` if the address is not an IP address.
+
+    '''
+    return socket.getaddrinfo(
+        host=address,
+        port=None,
+        family=family,
+        type=type,
+        flags=socket.AI_NUMERICHOST)[0][4]
+
+
 class ICMPSocket:
     '''
     Base class for ICMP sockets.
@@ -59,7 +94,8 @@ class ICMPSocket:
         socket.
 
     '''
-    __slots__ = '_sock', '_address', '_privileged'
+    __slots__ = '_sock', '_address', '_privileged', '_buffer', \
+                '_kernel_id', '_ttl', '_traffic_class'
 
     _IP_VERSION              = -1
     _ICMP_HEADER_OFFSET      = -1
@@ -77,6 +113,13 @@ class ICMPSocket:
     def __init__(self, address=None, privileged=True):
         self._sock = None
         self._address = address
+        self._kernel_id = None
+        self._ttl = None
+        self._traffic_class = None
+
+        # Incoming packets are written into this buffer to avoid
+        # allocating a new one each time a reply is received
+        self._buffer = memoryview(bytearray(1024))
 
         # The Linux kernel allows unprivileged users to use datagram
         # sockets (SOCK_DGRAM) to send ICMP requests. This feature is
@@ -101,6 +144,20 @@ class ICMPSocket:
 
             raise ICMPSocketError(str(err))
 
+        # Ask the kernel to timestamp incoming packets. This time is
+        # more accurate than the one measured once the packet has been
+        # read by the library. Some kernels do not support this option,
+        # in which case the time of reading is used.
+        if _KERNEL_TIMESTAMPS:
+            try:
+                self._sock.setsockopt(
+                    socket.SOL_SOCKET,
+                    _SO_TIMESTAMPNS,
+                    1)
+
+            except OSError:
+                pass
+
     def __enter__(self):
         '''
         Return this object.
@@ -152,39 +209,66 @@ class ICMPSocket:
         verify the integrity of packets.
 
         '''
-        sum = 0
-        data += b'\x00'
-
-        for i in range(0, len(data) - 1, 2):
-            sum += (data[i] << 8) + data[i + 1]
-            sum  = (sum & 0xffff) + (sum >> 16)
+        if len(data) % 2:
+            data = data + b'\x00'
 
-        sum = ~sum & 0xffff
+        # The 16-bit words are summed at once by the interpreter. The
+        # carries are then folded back into the lower 16 bits.
+        checksum = sum(unpack(f'!{len(data) // 2}H', data))
+        checksum = (checksum & 0xffff) + (checksum >> 16)
+        checksum = (checksum & 0xffff) + (checksum >> 16)
 
-        return sum
+        return ~checksum & 0xffff
 
     def _create_packet(self, id, sequence, payload):
         '''
         Build an ICMP packet from an identifier, a sequence number and
         a payload.
 
-        This method returns the newly created ICMP header concatenated
-        to the payload passed in parameters.
+        This method returns a `bytearray` containing the newly created
+        ICMP header followed by the payload passed in parameters.
 
         '''
-        checksum = 0
+        # The packet is built in a single buffer. The header is first
+        # written with a null checksum, which is then computed and
+        # written in place.
+        packet = bytearray(_ICMP_HEADER.size + len(payload))
+        packet[_ICMP_HEADER.size:] = payload
 
-        # Temporary ICMP header to compute the checksum
-        header = pack('!2B3H', self._ICMP_ECHO_REQUEST, 0, checksum,
+        _ICMP_HEADER.pack_into(packet, 0, self._ICMP_ECHO_REQUEST, 0, 0,
             id, sequence)
 
-        checksum = self._checksum(header + payload)
+        _ICMP_CHECKSUM.pack_into(packet, 2, self._checksum(packet))
 
-        # Definitive ICMP header
-        header = pack('!2B3H', self._ICMP_ECHO_REQUEST, 0, checksum,
-            id, sequence)
+        return packet
+
+    def _recvfrom(self):
+        '''
+        Receive a packet from the socket.
+
+        This method returns the packet, the IP address of the host that
+        sent it and its time of arrival. On Linux, the time of arrival
+        is provided by the kernel.
+
+        '''
+        if not _KERNEL_TIMESTAMPS:
+            bytes_read, address = self._sock.recvfrom_into(
+                self._buffer)
+
+            return self._buffer[:bytes_read], address[0], time()
 
-        return header + payload
+        bytes_read, ancdata, _, address = self._sock.recvmsg_into(
+            [self._buffer],
+            socket.CMSG_SPACE(_TIMESPEC.size))
+
+        current_time = None
+
+        for level, type, data in ancdata:
+            if level == socket.SOL_SOCKET and type == _SO_TIMESTAMPNS:
+                seconds, nanoseconds = _TIMESPEC.unpack_from(data)
+                current_time = seconds + nanoseconds / 1e9
+
+        return self._buffer[:bytes_read], address[0], current_time or time()
 
     def _parse_reply(self, packet, source, current_time):
         '''
@@ -195,43 +279,38 @@ class ICMPSocket:
 
         '''
         # On Linux, the IP header is missing when a datagram socket is
-        # used (SOCK_DGRAM). To keep the same behavior on all operating
-        # systems including macOS which has this header, we add a
-        # padding of the size of the missing IP header.
+        # used (SOCK_DGRAM). The ICMP header is then at the beginning of
+        # the packet.
         if not self._privileged and PLATFORM_LINUX:
-            packet = b'\x00' * self._ICMP_HEADER_OFFSET + packet
+            offset = 0
+        else:
+            offset = self._ICMP_HEADER_OFFSET
 
-        bytes_received = len(packet) - self._ICMP_HEADER_OFFSET
-
-        if len(packet) < self._ICMP_CHECKSUM_OFFSET:
+        if len(packet) < offset + 2:
             return None
 
-        type, code = unpack('!2B', packet[
-            self._ICMP_HEADER_OFFSET:
-            self._ICMP_CHECKSUM_OFFSET])
+        # Fields are read in place from the receive buffer, without
+        # copying the packet
+        type, code = _ICMP_TYPE_CODE.unpack_from(packet, offset)
+        bytes_received = len(packet) - offset
 
+        # ICMP error messages contain the IP header and the ICMP header
+        # of the request that caused them
         if type != self._ICMP_ECHO_REPLY:
-            packet = packet[
+            offset += (
                 self._ICMP_PAYLOAD_OFFSET
                 - self._ICMP_HEADER_OFFSET
-                + self._ICMP_HEADER_REAL_OFFSET:]
+                + self._ICMP_HEADER_REAL_OFFSET)
 
-        if len(packet) < self._ICMP_PAYLOAD_OFFSET:
+        if len(packet) < offset + 8:
             return None
 
-        id, sequence = unpack('!2H', packet[
-            self._ICMP_ID_OFFSET:
-            self._ICMP_PAYLOAD_OFFSET])
+        id, sequence = _ICMP_ID_SEQUENCE.unpack_from(packet, offset + 4)
 
-        return ICMPReply(
-            source=source,
-            family=self._IP_VERSION,
-            id=id,
-            sequence=sequence,
-            type=type,
-            code=code,
-            bytes_received=bytes_received,
-            time=current_time)
+        # Arguments are passed by position, which is faster than by
+        # keyword for a call made for each packet received
+        return ICMPReply(source, self._IP_VERSION, id, sequence, type,
+            code, bytes_received, current_time)
 
     def send(self, request):
         '''
@@ -257,19 +336,34 @@ class ICMPSocket:
             raise SocketUnavailableError
 
         try:
-            sock_destination = socket.getaddrinfo(
-                host=request.destination,
-                port=None,
-                family=self._sock.family,
-                type=self._sock.type)[0][4]
+            try:
+                sock_destination = _get_sock_address(
+                    request.destination,
+                    self._sock.family,
+                    self._sock.type)
+
+            except socket.gaierror:
+                sock_destination = socket.getaddrinfo(
+                    host=request.destination,
+                    port=None,
+                    family=self._sock.family,
+                    type=self._sock.type)[0][4]
 
             packet = self._create_packet(
                 id=request.id,
                 sequence=request.sequence,
                 payload=request.payload)
 
-            self._set_ttl(request.ttl)
-            self._set_traffic_class(request.traffic_class)
+            # The TTL and the traffic class are only changed when they
+            # differ from those of the previous request, which saves
+            # system calls for each packet
+            if request.ttl != self._ttl:
+                self._set_ttl(request.ttl)
+                self._ttl = request.ttl
+
+            if request.traffic_class != self._traffic_class:
+                self._set_traffic_class(request.traffic_class)
+                self._traffic_class = request.traffic_class
 
             request._time = time()
             self._sock.sendto(packet, sock_destination)
@@ -278,8 +372,13 @@ class ICMPSocket:
             # kernel with a random port number when a datagram socket is
             # used (SOCK_DGRAM). So, we update the request created by
             # the user to take this new identifier into account.
+            # This identifier does not change during the lifetime of
+            # the socket, so it is only retrieved once.
             if not self._privileged and PLATFORM_LINUX:
-                request._id = self._sock.getsockname()[1]
+                if self._kernel_id is None:
+                    self._kernel_id = self._sock.getsockname()[1]
+
+                request._id = self._kernel_id
 
         except PermissionError:
             raise SocketBroadcastError
@@ -317,18 +416,23 @@ class ICMPSocket:
         if not self._sock:
             raise SocketUnavailableError
 
-        self._sock.settimeout(timeout)
-        time_limit = time() + timeout
+        # Each call to `settimeout` issues a system call to change the
+        # blocking mode of the socket. Most of the time, the timeout is
+        # the same as for the previous call.
+        if self._sock.gettimeout() != timeout:
+            self._sock.settimeout(timeout)
+
+        # The time limit is based on a monotonic clock so that it is not
+        # affected by changes of the system time. Timestamps of requests
+        # and replies remain wall-clock times.
+        time_limit = monotonic() + timeout
 
         try:
             while True:
-                response = self._sock.recvfrom(1024)
-                current_time = time()
+                packet, source, current_time = self._recvfrom()
+                remaining_time = time_limit - monotonic()
 
-                packet = response[0]
-                source = response[1][0]
-
-                if current_time > time_limit:
+                if remaining_time <= 0:
                     raise socket.timeout
 
                 reply = self._parse_reply(
@@ -341,6 +445,12 @@ class ICMPSocket:
                     request.sequence == reply.sequence):
                     return reply
 
+                # The packet is not the one we are waiting for. Several
+                # replies can be queued on the socket (broadcast, other
+                # processes...), so we only wait for the remaining time
+                # to avoid exceeding the timeout.
+                self._sock.settimeout(remaining_time)
+
         except socket.timeout:
             raise TimeoutExceeded(timeout)
 
@@ -463,7 +573,7 @@ class ICMPv4Socket(ICMPSocket):
         socket.
 
     '''
-    __slots__ = '_sock', '_address', '_privileged'
+    __slots__ = ()
 
     _IP_VERSION              = 4
     _ICMP_HEADER_OFFSET      = 20
@@ -593,7 +703,7 @@ class ICMPv6Socket(ICMPSocket):
         socket.
 
     '''
-    __slots__ = '_sock', '_address', '_privileged'
+    __slots__ = ()
 
     _IP_VERSION              = 6
     _ICMP_HEADER_OFFSET      = 0
@@ -659,16 +769,23 @@ class AsyncSocket:
     '''
     A wrapper for ICMP sockets which makes them asynchronous.
 
+    Several coroutines can wait for replies on the same socket at the
+    same time. Incoming packets are read by a single task and each
+    reply is delivered to the coroutine waiting for it.
+
     :type icmp_sock: ICMPSocket
     :param icmp_sock: An ICMP socket. Once the wrapper is instantiated,
         this socket should no longer be used directly.
 
     '''
-    __slots__ = '_icmp_sock'
+    __slots__ = '_icmp_sock', '_waiters', '_pending', '_reader'
 
     def __init__(self, icmp_sock):
         self._icmp_sock = icmp_sock
         self._icmp_sock.blocking = False
+        self._waiters = {}
+        self._pending = 0
+        self._reader = None
 
     def __getattr__(self, name):
         '''
@@ -701,6 +818,77 @@ class AsyncSocket:
         '''
         self.close()
 
+    async def _read(self, sock):
+        '''
+        Read the packets arriving on the socket and deliver each reply
+        to the coroutine waiting for it. Replies that no coroutine is
+        waiting for are discarded.
+
+        This task stops as soon as no coroutine is waiting for a reply,
+        so that packets already queued on the socket are left to the
+        next calls to `receive`.
+
+        '''
+        loop = asyncio.get_running_loop()
+        buffer = self._icmp_sock._buffer
+
+        try:
+            while self._pending:
+                # Packets are written into the buffer of the ICMP socket
+                # rather than into a new bytes object
+                bytes_read = await loop.sock_recv_into(sock, buffer)
+                packet = buffer[:bytes_read]
+                current_time = time()
+
+                reply = self._icmp_sock._parse_reply(
+                    packet=packet,
+                    source=None,
+                    current_time=current_time)
+
+                if not reply:
+                    continue
+
+                # Coroutines waiting for this specific reply take
+                # precedence over those waiting for any reply
+                if not self._deliver((reply.id, reply.sequence), reply):
+                    self._deliver(None, reply)
+
+        except OSError as err:
+            for futures in self._waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(ICMPSocketError(str(err)))
+                        self._pending -= 1
+
+    def _deliver(self, key, reply):
+        '''
+        Deliver a reply to the first coroutine waiting with the
+        specified key. Return `True` if the reply has been delivered.
+
+        '''
+        for future in self._waiters.get(key, ()):
+            if not future.done():
+                future.set_result(reply)
+                self._pending -= 1
+                return True
+
+        return False
+
+    def _stop_reading(self, loop, sock):
+        '''
+        Stop the task reading the packets arriving on the socket.
+
+        '''
+        self._reader.cancel()
+        self._reader = None
+
+        # Nothing to remove if the socket has already been closed
+        if sock.fileno() == -1:
+            return
+
+        if isinstance(loop, asyncio.SelectorEventLoop):
+            loop.remove_reader(sock)
+
     async def receive(self, request=None, timeout=2):
         '''
         Receive an ICMP reply message from the socket.
@@ -708,7 +896,9 @@ class AsyncSocket:
         This method can be called multiple times if you expect several
         responses as with a broadcast address.
 
-        This method is non-blocking.
+        This method is non-blocking and can be called concurrently by
+        several coroutines, for instance to wait for the replies to
+        different requests sent from the same socket.
 
         :type request: ICMPRequest, optional
         :param request: The ICMP request to use to match the response.
@@ -737,41 +927,35 @@ class AsyncSocket:
             raise SocketUnavailableError
 
         loop = asyncio.get_running_loop()
-        time_limit = time() + timeout
-        remaining_time = timeout
+        sock = self._icmp_sock._sock
+        key = request and (request.id, request.sequence)
+        future = loop.create_future()
 
-        try:
-            while True:
-                packet = await asyncio.wait_for(
-                    loop.sock_recv(self._icmp_sock._sock, 1024),
-                    remaining_time)
-
-                current_time = time()
-
-                if current_time > time_limit:
-                    raise asyncio.TimeoutError
-
-                reply = self._parse_reply(
-                    packet=packet,
-                    source=None,
-                    current_time=current_time)
+        futures = self._waiters.setdefault(key, [])
+        futures.append(future)
+        self._pending += 1
 
-                if (reply and not request or
-                    reply and request.id == reply.id and
-                    request.sequence == reply.sequence):
-                    return reply
+        if not self._reader or self._reader.done():
+            self._reader = loop.create_task(self._read(sock))
 
-                remaining_time = time_limit - current_time
+        try:
+            return await asyncio.wait_for(future, timeout)
 
         except asyncio.TimeoutError:
             raise TimeoutExceeded(timeout)
 
-        except OSError as err:
-            raise ICMPSocketError(str(err))
-
         finally:
-            if isinstance(loop, asyncio.SelectorEventLoop):
-                loop.remove_reader(self._icmp_sock._sock)
+            # The future is cancelled if no reply has been delivered
+            if future.cancelled():
+                self._pending -= 1
+
+            futures.remove(future)
+
+            if not futures:
+                del self._waiters[key]
+
+            if not self._waiters and self._reader:
+                self._stop_reading(loop, sock)
 
     def detach(self):
         '''
@@ -26,13 +26,12 @@
     <https://www.gnu.org/licenses/>.
 '''
 
-import socket, asyncio
+import socket, asyncio, re
 
 from threading import Lock
 from sys import platform
 from os import getpid
-from re import match
-from random import choices
+from random import getrandbits
 
 from .exceptions import NameLookupError
 
@@ -45,18 +44,36 @@ PLATFORM_WINDOWS = platform == 'win32'
 _lock_id = Lock()
 _current_id = PID
 
+# Delay in seconds after which `async_resolve` also searches for IPv6
+# addresses if the search for IPv4 addresses is not over
+_IPV6_LOOKUP_DELAY = 0.1
+
+_HOSTNAME_PATTERN = re.compile(
+    r'(?i)^([a-z0-9-]+|([a-z0-9_-]+[.])+[a-z]+)$')
+
+_IPV4_PATTERN = re.compile(
+    r'^([0-9]{1,3}[.]){3}[0-9]{1,3}$')
+
+# Maps each of the 256 byte values to an alphanumeric character
+_RANDOM_MESSAGE_TABLE = bytes(
+    b'abcdefghijklmnopqrstuvwxyz'
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    b'1234567890'[i % 62] for i in range(256))
+
 
 def random_byte_message(size):
     '''
     Generate a random byte sequence of the specified size.
 
     '''
-    sequence = choices(
-        b'abcdefghijklmnopqrstuvwxyz'
-        b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-        b'1234567890', k=size)
+    if size <= 0:
+        return b''
+
+    # Random bytes are drawn at once and converted in a single pass,
+    # without building an intermediate list
+    sequence = getrandbits(size * 8).to_bytes(size, 'little')
 
-    return bytes(sequence)
+    return sequence.translate(_RANDOM_MESSAGE_TABLE)
 
 
 def unique_identifier():
@@ -147,14 +164,47 @@ async def async_resolve(name, family=None):
         cannot be resolved.
 
     '''
+    loop = asyncio.get_running_loop()
+
+    if not family:
+        lookup_ipv4 = loop.create_task(async_resolve(name, 4))
+        lookup_ipv6 = None
+
+        try:
+            # The AAAA lookup is only started if the A lookup is slow,
+            # so that its result is available sooner if no IPv4 address
+            # is found. IPv4 addresses are still preferred.
+            await asyncio.wait((lookup_ipv4,), timeout=_IPV6_LOOKUP_DELAY)
+
+            if not lookup_ipv4.done():
+                lookup_ipv6 = loop.create_task(async_resolve(name, 6))
+
+            try:
+                return await lookup_ipv4
+
+            except NameLookupError:
+                pass
+
+            if not lookup_ipv6:
+                lookup_ipv6 = loop.create_task(async_resolve(name, 6))
+
+            return await lookup_ipv6
+
+        finally:
+            lookup_ipv4.cancel()
+
+            if lookup_ipv6 and not lookup_ipv6.cancel() \
+                    and not lookup_ipv6.cancelled():
+                # Retrieve the exception, if any, to prevent asyncio
+                # from reporting it
+                lookup_ipv6.exception()
+
     try:
         if family == 6:
             _family = socket.AF_INET6
         else:
             _family = socket.AF_INET
 
-        loop = asyncio.get_running_loop()
-
         lookup = await loop.getaddrinfo(
             host=name,
             port=None,
@@ -164,8 +214,7 @@ async def async_resolve(name, family=None):
         return [address[4][0] for address in lookup]
 
     except OSError:
-        if not family:
-            return await async_resolve(name, 6)
+        pass
 
     raise NameLookupError(name)
 
@@ -176,8 +225,7 @@ def is_hostname(name):
     Return a `boolean`.
 
     '''
-    pattern = r'(?i)^([a-z0-9-]+|([a-z0-9_-]+[.])+[a-z]+)$'
-    return match(pattern, name) is not None
+    return _HOSTNAME_PATTERN.match(name) is not None
 
 
 def is_ipv4_address(address):
@@ -186,8 +234,10 @@ def is_ipv4_address(address):
     Return a `boolean`.
 
     '''
-    pattern = r'^([0-9]{1,3}[.]){3}[0-9]{1,3}$'
-    return match(pattern, address) is not None
+    if ':' in address:
+        return False
+
+    return _IPV4_PATTERN.match(address) is not None
 
 
 def is_ipv6_address(address):